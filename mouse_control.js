@@ -115,7 +115,7 @@
             window._lockedElement = element;
 
             console.log('Selected primary element (golden):', JSON.stringify(window._selectedElement));
-            fetch('http://127.0.0.1:8080/api/notify-primary-selected', {mode: 'no-cors' });
+            window.pyOnElementSelected(window._selectedElement); // Push the data to Python
         } else {
             // Secondary (green) element clicked
             if (!element.classList.contains('annotation-secondary') && element !== window._lockedElement) {
@@ -136,7 +136,7 @@
                 window._secondaryElements.push(secondaryElementData);
                 window._secondaryActualElement.push(element);
                 console.log('Selected secondary element (green):', JSON.stringify(secondaryElementData));
-                fetch('http://127.0.0.1:8080/api/notify-secondary-selected', {mode: 'no-cors' });
+                window.pyOnSecondaryElementSelected(secondaryElementData); // Push the data to Python
             }
         }
     };
@@ -1,49 +1,185 @@
 #!/usr/bin/env python3
 import asyncio
+import functools
+import gzip
+import hashlib
 import logging
+from collections import deque
 import os
-import json
+import pathlib
+import re
 from datetime import datetime
-from typing import List, Dict, Optional
-from difflib import SequenceMatcher
+from html import escape
+from typing import Callable, List, Dict, Optional
 from screeninfo import get_monitors
-import random
-import string
-import zipfile
-import shutil
+import secrets
 
 # Import NiceGUI components
 from nicegui import app, ui, context
 
+# Use app context if available (newer NiceGUI versions), resolved once at import
+_register_shutdown = context.app.on_shutdown if hasattr(context, 'app') else app.on_shutdown
+
 # Import Playwright
-from playwright.async_api import async_playwright, Playwright, Page
+from playwright.async_api import async_playwright, Playwright, Page, Locator
+
+# orjson is optional; _dumps_json falls back to the stdlib encoder without it
+try:
+    import orjson
+except ImportError:
+    orjson = None
+    import json
+
+# rapidfuzz is optional; _best_option_index falls back to the pure-Python difflib matcher without it
+try:
+    from rapidfuzz import process, fuzz
+except ImportError:
+    process = None
 
 # Constants
 ACTION_TYPES = ["click", "type", "select", "ignore", "final_click"]
 DEFAULT_URL = "https://www.digikala.com/"
-with open("mouse_control.js") as f:
-    mouse_control_js = f.read()
-with open("new_tab_link_prevention.js") as f:
-    new_tab_prevention_js = f.read()
+LOG_MAX_LINES = 50  # Lines kept by the UI log and its backing buffer
+LOG_FLUSH_DELAY = 0.05  # Seconds log entries are collected before they are pushed to the UI in one update
+SCREENSHOT_JPEG_QUALITY = 75  # Step screenshots are JPEG; PNG encoding was the slow part of each capture
+
+# UI styling: Tailwind classes and Quasar props shared by the widgets built in setup_ui
+MAIN_CONTAINER_CLASSES = 'h-screen w-full fixed left-0 top-0 bg-gray-100 overflow-auto p-1'
+SECTION_CLASSES = 'w-full mb-1'
+FIELD_PROPS = 'dense outlined'
+LOG_CLASSES = 'w-full h-64 bg-gray-100 rounded p-2 font-mono text-sm'
+STATUS_BAR_CLASSES = 'flex w-full mt-auto bg-gray-200 p-1 rounded-lg items-center'
+# Icon and text of the status bar rendered as a single element
+STATUS_BAR_HTML = '<i class="material-icons text-primary mr-1">info</i><span class="text-sm">{status}</span>'
+# XPaths built by getXPath in mouse_control.js without an id step: every step below body carries a position index
+_FULLY_INDEXED_XPATH = re.compile(r'/html/body(?:/[^/\[\]]+\[\d+\])*')
+
+
+@functools.cache
+def _load_js(name: str) -> str:
+    """Read a browser script shipped next to this file, once, on first use"""
+    return (pathlib.Path(__file__).parent / name).read_text()
+
+
+def _as_init_script(js: str) -> str:
+    """Wrap a `() => {...}` snippet so it runs on every new document once the DOM is ready"""
+    return f"document.addEventListener('DOMContentLoaded', {js.strip().rstrip(';')});"
+
+
+@functools.cache
+def _get_init_js() -> str:
+    """Annotation and new tab prevention scripts combined into a single init script"""
+    return "\n".join(_as_init_script(_load_js(name)) for name in ("mouse_control.js", "new_tab_link_prevention.js"))
+
+
+def _best_option_index(text: str, options: List[str]) -> int:
+    """Return the index of the option that best matches text, ignoring case, or -1 if there are no options"""
+    # Case-fold everything once instead of inside every comparison
+    target = text.casefold()
+    folded = [option.casefold() for option in options]
+    if target in folded:
+        return folded.index(target)
+
+    if process is not None:
+        match = process.extractOne(target, folded, scorer=fuzz.ratio)
+        return match[2] if match else -1
+
+    from difflib import SequenceMatcher  # Only needed without rapidfuzz, and only once a select is recorded
+
+    # SequenceMatcher indexes its second sequence once; reuse it and only swap in each option
+    matcher = SequenceMatcher(None, b=target)
+    best_index, best_similarity = -1, -1
+    for i, option in enumerate(folded):
+        matcher.set_seq1(option)
+        similarity = matcher.ratio()
+        if similarity > best_similarity:
+            best_index, best_similarity = i, similarity
+    return best_index
+
+
+@functools.cache
+def _primary_monitor():
+    """Primary monitor, queried from the OS once; it sizes every browser context"""
+    return get_monitors()[0]
+
+
+def _dumps_json(obj, indent: bool = True) -> bytes:
+    """Encode obj as UTF-8 JSON, serialising datetimes as ISO 8601 strings; compact on one line unless indent"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=datetime.isoformat).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=datetime.isoformat).encode("utf-8")
+
+
+def _write_gzip(path: str, data: bytes):
+    """Write data to path gzip-compressed"""
+    with gzip.open(path, "wb", compresslevel=6) as f:
+        f.write(data)
+
+
+def _write_actions_json(path: str, header: bytes, actions_path: str) -> bytes:
+    """Write the indented header object to path with the JSON lines of actions_path appended as its "actions" list
+
+    Returns the written document so it can be zipped without reading the file back.
+    """
+    with open(actions_path, "rb") as f:
+        actions = [line.rstrip(b"\n") for line in f if line.strip()]
+    # header ends with the object's closing brace; reopen it for the actions member
+    parts = [header[:header.rindex(b"}")].rstrip(), b',\n  "actions": [']
+    if actions:
+        parts.append(b"\n    " + b",\n    ".join(actions) + b"\n  ")
+    parts.append(b"]\n}")
+    payload = b"".join(parts)
+    _write_bytes(path, payload)
+    return payload
+
+
+def _write_bytes(path: str, data: bytes):
+    """Write data to path, replacing any existing file"""
+    with open(path, "wb") as f:
+        f.write(data)
+
 
 class AnnotationFramework:
+    # Playwright and the browser process are shared by every launch; only the context is per launch
+    playwright: Optional[Playwright] = None
+    browser = None
+    # Per-launch state only; playwright and browser above stay class attributes
+    __slots__ = (
+        'context', 'page', 'logger', 'task_name', '_main_path', '_screenshots_dir', '_html_dir', '_html_seen',
+        'is_tracing', 'root_path', 'screen_counter', '_locator_cache', '_pending_writes', 'on_element_selected',
+        'on_secondary_element_selected',
+    )
+
     def __init__(self):
-        self.playwright: Optional[Playwright] = None
-        self.browser = None
         self.context = None
         self.page: Optional[Page] = None
         self.logger = self._setup_logger()
         self.task_name = None
+        self._main_path = None  # Set per task by set_task_name
+        self._screenshots_dir = None
+        self._html_dir = None
+        self._html_seen = set()  # Digests of the page snapshots already stored for the current task
         self.is_tracing = False
         self.root_path = os.getcwd()
         self.screen_counter = 0
+        self._locator_cache: Dict[tuple, Locator] = {}
+        self._pending_writes: List[asyncio.Task] = []  # Background writes of captured screenshots and page snapshots
+        # Called with the element data when the user locks a primary/secondary element in the browser
+        self.on_element_selected: Optional[Callable[[Dict], None]] = None
+        self.on_secondary_element_selected: Optional[Callable[[Dict], None]] = None
 
     async def set_task_name(self):
-        chars = string.ascii_lowercase + string.ascii_uppercase + string.digits
-        self.task_name = ''.join(random.choice(chars) for _ in range(8))
-        os.makedirs(self.main_path, exist_ok=True)
-        os.makedirs(os.path.join(self.main_path, 'playwright_traces'), exist_ok=True)
-        os.makedirs(os.path.join(self.main_path, 'screenshots'), exist_ok=True)
+        self.task_name = secrets.token_hex(4)
+        self._main_path = os.path.join(self.root_path, "annotation_data", self.task_name)
+        self._screenshots_dir = os.path.join(self._main_path, 'screenshots')
+        self._html_dir = os.path.join(self._main_path, 'html')
+        self._html_seen = set()
+        # Creating the leaf directories creates main_path as well
+        os.makedirs(os.path.join(self._main_path, 'playwright_traces'), exist_ok=True)
+        os.makedirs(self._screenshots_dir, exist_ok=True)
+        os.makedirs(self._html_dir, exist_ok=True)
         self.screen_counter = 0
 
     @staticmethod
@@ -75,7 +211,7 @@ class AnnotationFramework:
 
     @property
     def main_path(self):
-        return os.path.join(self.root_path, "annotation_data", self.task_name)
+        return self._main_path
 
     async def start_recording(self):
         if self.is_tracing:
@@ -104,17 +240,20 @@ class AnnotationFramework:
     async def start(self, website=DEFAULT_URL):
         """Start the browser and navigate to the specified website"""
         try:
-            self.playwright = await async_playwright().start()
-            # Consider launching in headed mode for the user to see
-            self.browser = await self.playwright.chromium.launch(headless=False,
-                                                                 traces_dir=os.path.join(self.root_path, "annotation_data", "tr") )
+            await self._ensure_browser()
 
-            primary_monitor = get_monitors()[0]
+            primary_monitor = _primary_monitor()
             self.context = await self.browser.new_context(
                 user_agent="Mozilla/5.0 (Windows NT 10.0; WOW64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/109.0.0.0 Safari/537.36",
                 viewport={"width": int(primary_monitor.width * 5 / 10),
                           "height": int(primary_monitor.height * 21 / 30)})
+            # Inject the browser scripts into every document of the context, including after reloads
+            await self.context.add_init_script(script=_get_init_js())
+            await self.context.expose_binding("pyOnElementSelected", self._element_selected_binding)
+            await self.context.expose_binding("pyOnSecondaryElementSelected", self._secondary_element_selected_binding)
             self.page = await self.context.new_page()
+            # Cached locators are only valid for the document they were resolved against
+            self.page.on("framenavigated", lambda _: self._locator_cache.clear())
 
             # Navigate to website
             await self.page.goto(website)
@@ -125,6 +264,46 @@ class AnnotationFramework:
             await self.stop()  # Clean up if start fails partially
             raise  # Re-raise the exception
 
+    async def _ensure_browser(self):
+        """Start Playwright and launch the shared browser unless it is already running"""
+        cls = AnnotationFramework
+        if cls.browser and cls.browser.is_connected():
+            return
+        if not cls.playwright:
+            cls.playwright = await async_playwright().start()
+        # Consider launching in headed mode for the user to see
+        cls.browser = await cls.playwright.chromium.launch(headless=False,
+                                                           traces_dir=os.path.join(self.root_path, "annotation_data", "tr"))
+        self.logger.info("Browser launched")
+
+    @classmethod
+    async def close_browser(cls):
+        """Close the shared browser and stop Playwright"""
+        logger = cls._setup_logger()
+        if cls.browser:
+            try:
+                await cls.browser.close()
+            except Exception as e:
+                logger.warning(f"Error closing browser: {e}")
+        if cls.playwright:
+            try:
+                await cls.playwright.stop()
+            except Exception as e:
+                logger.warning(f"Error stopping Playwright: {e}")
+        cls.browser = None
+        cls.playwright = None
+        logger.info("Playwright stopped")
+
+    def is_running(self) -> bool:
+        """Whether the page and the shared browser behind it are still usable"""
+        return bool(self.page and not self.page.is_closed() and self.browser and self.browser.is_connected())
+
+    async def navigate(self, website):
+        """Navigate the open page to another website, keeping the context and its scripts"""
+        await self.page.goto(website)
+        self.logger.info(f"Navigated to {website}")
+        return self.page
+
     async def refresh_page(self):
         """Refresh the current browser page"""
         try:
@@ -141,8 +320,8 @@ class AnnotationFramework:
             return False
 
     async def stop(self):
-        """Stop the browser"""
-        self.logger.info("Stopping Playwright...")
+        """Close the page and context, keeping the shared browser running"""
+        self.logger.info("Closing browser context...")
         if self.page and not self.page.is_closed():
             try:
                 await self.page.close()
@@ -153,38 +332,20 @@ class AnnotationFramework:
                 await self.context.close()
             except Exception as e:
                 self.logger.warning(f"Error closing context: {e}")
-        if self.browser:
-            try:
-                await self.browser.close()
-            except Exception as e:
-                self.logger.warning(f"Error closing browser: {e}")
-        if self.playwright:
-            try:
-                await self.playwright.stop()
-            except Exception as e:
-                self.logger.warning(f"Error stopping Playwright: {e}")
 
-        self.playwright = None
-        self.browser = None
         self.context = None
         self.page = None
-        self.logger.info("Playwright stopped")
+        self.logger.info("Browser context closed")
 
-    async def setup_element_tracking(self):
-        """Setup browser to track selected elements"""
-        if not self.page:
-            self.logger.error("Error: No active page for element tracking setup")
-            return
+    def _element_selected_binding(self, source, element_data: Dict):
+        """Receive the primary element pushed by the browser through window.pyOnElementSelected"""
+        if self.on_element_selected:
+            self.on_element_selected(element_data)
 
-        try:
-            await self.page.evaluate(mouse_control_js)
-            await self.page.evaluate(new_tab_prevention_js)
-            # Expose Python function to be called from JS
-            # Use a unique name or check if already exposed if page reloads cause issues
-            self.logger.info("Element tracking script injected.")
-        except Exception as e:
-            self.logger.error(f"Error setting up 'element racking': {e}")
-            raise
+    def _secondary_element_selected_binding(self, source, element_data: Dict):
+        """Receive a secondary element pushed by the browser through window.pyOnSecondaryElementSelected"""
+        if self.on_secondary_element_selected:
+            self.on_secondary_element_selected(element_data)
 
     async def set_annotation_mode(self, enabled: bool):
         if not self.page: return
@@ -194,6 +355,20 @@ class AnnotationFramework:
         except Exception as e:
             self.logger.error(f"Error setting annotation mode in browser: {e}")
 
+    async def unlock_and_disable_annotation(self):
+        """Unlock all elements and leave annotation mode in one round-trip, resolving at the next animation frame"""
+        if not self.page: return
+        try:
+            # rAF never fires while the window is minimized, so the wait for the next animation frame is capped at one second
+            painted = await self.page.evaluate(
+                "() => { window.unlockElement(); window.setAnnotationMode(false);"
+                " return new Promise(r => { requestAnimationFrame(() => r(true)); setTimeout(() => r(false), 1000); }); }")
+            if not painted:
+                self.logger.warning("No animation frame within 1 s after disabling annotation mode, continuing anyway.")
+            self.logger.info("Unlocked elements and disabled annotation mode in browser.")
+        except Exception as e:
+            self.logger.error(f"Error disabling annotation mode in browser: {e}")
+
     async def unlock_element_in_browser(self):
         if not self.page: return
         try:
@@ -202,57 +377,39 @@ class AnnotationFramework:
         except Exception as e:
             self.logger.error(f"Error unlocking element in browser: {e}")
 
-    async def get_selected_element_data_from_browser(self) -> Optional[Dict]:
-        if not self.page: return None
-        try:
-            element_data = await self.page.evaluate("() => window._selectedElement")
-            return element_data
-        except Exception as e:
-            self.logger.error(f"Error getting selected element data from browser: {e}")
-            return None
-
-    async def get_secondary_selected_elements_data_from_browser(self) -> Optional[List[Dict]]:
-        if not self.page:
-            return None
-        try:
-            # Evaluate `window._secondaryElements` in the browser context
-            secondary_elements_data = await self.page.evaluate(
-                "() => window._secondaryElements.map(e => ({ ...e, domElement: undefined }))")
-            # The `domElement` is excluded because Python can't process DOM objects
-            return secondary_elements_data
-        except Exception as e:
-            self.logger.error(f"Error getting secondary selected elements data from browser: {e}")
-            return None
-
     async def _find_element(self, element_data: Dict):
         """Helper to find element using various strategies"""
         if not self.page: raise Exception("Playwright page not available")
 
-        # Prefer XPath if available and valid
+        key = (element_data.get('xpath'), element_data.get('id'))
+        if key in self._locator_cache:
+            return self._locator_cache[key]
+
+        # Fully indexed XPaths from the root are unique by construction, skip the count check
         xpath = element_data.get('xpath')
-        if xpath:
-            try:
-                # Check if XPath uniquely identifies the element
-                count = await self.page.locator(f"xpath={xpath}").count()
-                if count == 1:
-                    return self.page.locator(f"xpath={xpath}")
-                else:
-                    self.logger.warning(f"XPath '{xpath}' matched {count} elements, expected 1. Trying other methods.")
-            except Exception as e:
-                self.logger.warning(f"XPath '{xpath}' failed: {e}. Trying other methods.")
+        if xpath and _FULLY_INDEXED_XPATH.fullmatch(xpath):
+            loc = self.page.locator(f"xpath={xpath}")
+            self._locator_cache[key] = loc
+            return loc
 
-        # Try ID if available
+        # Candidate strategies in order of preference: XPath, then ID
+        candidates = []
+        if xpath:
+            candidates.append((f"XPath '{xpath}'", self.page.locator(f"xpath={xpath}")))
         element_id = element_data.get('id')
         if element_id:
-            selector = f"#{element_id}"
-            try:
-                count = await self.page.locator(selector).count()
-                if count == 1:
-                    return self.page.locator(selector)
-                else:
-                    self.logger.warning(f"ID selector '{selector}' matched {count} elements. Trying other methods.")
-            except Exception as e:
-                self.logger.warning(f"ID selector '{selector}' failed: {e}. Trying other methods.")
+            candidates.append((f"ID selector '#{element_id}'", self.page.locator(f"#{element_id}")))
+
+        # Check all candidates for uniqueness concurrently, one round-trip instead of one per strategy
+        counts = await asyncio.gather(*(loc.count() for _, loc in candidates), return_exceptions=True)
+        for (label, loc), count in zip(candidates, counts):
+            if isinstance(count, Exception):
+                self.logger.warning(f"{label} failed: {count}. Trying other methods.")
+            elif count == 1:
+                self._locator_cache[key] = loc
+                return loc
+            else:
+                self.logger.warning(f"{label} matched {count} elements, expected 1. Trying other methods.")
 
         # If nothing worked
         error_msg = f"Could not reliably locate element: {element_data}"
@@ -288,46 +445,96 @@ class AnnotationFramework:
             return False
 
     async def get_raw_html(self):
-        return await self.page.evaluate("document.documentElement.outerHTML")
+        return await self.page.content()
 
     async def get_accessibility_tree(self):
         return self.page.accessibility.snapshot()
 
     async def get_screenshot(self):
         try:
-            path = os.path.join(self.main_path, 'screenshots', f"{self.screen_counter}.png")
-            await self.page.screenshot(path=path)
+            path = os.path.join(self._screenshots_dir, f"{self.screen_counter}.jpg")
+            # Capture before returning so the screenshot shows the page before the action;
+            # only writing it to disk happens in the background
+            data = await self.page.screenshot(type="jpeg", quality=SCREENSHOT_JPEG_QUALITY)
+            self._pending_writes.append(asyncio.create_task(asyncio.to_thread(_write_bytes, path, data)))
             self.screen_counter+=1
             return path
         except Exception as e:
             self.logger.info(f"Failed to take screenshot: {e}")
             return None
 
+    async def save_raw_html(self) -> Optional[str]:
+        """Store the page HTML under html/, once per distinct content, and return its path relative to main_path"""
+        try:
+            data = (await self.get_raw_html()).encode("utf-8")
+            # Consecutive actions on an unchanged page share one compressed copy
+            digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+            if digest not in self._html_seen:
+                self._html_seen.add(digest)
+                path = os.path.join(self._html_dir, f"{digest}.html.gz")
+                self._pending_writes.append(asyncio.create_task(asyncio.to_thread(_write_gzip, path, data)))
+            return f"html/{digest}.html.gz"
+        except Exception as e:
+            self.logger.info(f"Failed to save page HTML: {e}")
+            return None
+
+    async def flush_writes(self):
+        """Wait until all captured screenshots and page snapshots are written to disk"""
+        writes, self._pending_writes = self._pending_writes, []
+        for result in await asyncio.gather(*writes, return_exceptions=True):
+            if isinstance(result, Exception):
+                self.logger.info(f"Failed to write capture: {result}")
+
+    async def get_select_options(self, element_data: Dict) -> List[Dict]:
+        """Read value and text of every option of a SELECT element in a single round-trip"""
+        element_locator = await self._find_element(element_data)
+        # The locator may be cached or unchecked; fail fast if the element is gone instead of waiting 30 s for it
+        return await element_locator.evaluate(
+            "el => Array.from(el.options).map(o => ({value: o.getAttribute('value') || '', text: o.text}))",
+            timeout=2000)
+
     async def select_option(self, element_data: Dict, text: str):
         """Type text into an element based on element data"""
         if not self.page:
             self.logger.error("No page available to select")
             return False
         try:
-            element_locator = await self._find_element(element_data)
-
-            best_option = [-1, "", -1]
-            for i in range(await element_locator.locator("option").count()):
-                option = await element_locator.locator("option").nth(i).inner_text()
-                similarity = SequenceMatcher(None, option, text).ratio()
-                if similarity > best_option[2]:
-                    best_option = [i, option, similarity]
-            await element_locator.select_option(index=best_option[0], timeout=10000)
+            # Fetch all options in a single round-trip and score them locally
+            options = await self.get_select_options(element_data)
+            best_index = _best_option_index(text, [option['text'] for option in options])
+            element_locator = await self._find_element(element_data)  # Cached by get_select_options
+            await element_locator.select_option(index=best_index, timeout=10000)
             self.logger.info(f"selected '{text}' into element: {element_data.get('tagName')}")
             return True
         except Exception as e:
             self.logger.error(f"Error selection option into element ({element_data.get('xpath', 'N/A')}): {e}")
             return False
 
+    # Executes an action type in the browser, called as handler(framework, element_data, value); built once per class
+    ACTION_HANDLERS: Dict[str, Callable] = {
+        "click": lambda self, element_data, value: self.click_element(element_data),
+        "type": type_text,
+        "select": select_option,
+    }
+
 
 
 # --- NiceGUI Application Class ---
 class AnnotationUI:
+    # Long-lived singleton with a fixed set of attributes; no per-instance __dict__
+    __slots__ = (
+        # UI elements
+        'record_button', 'value_input', 'action_select', 'task_button', 'task_goal', 'launch_button', 'url_input',
+        'main_container', 'options_select', 'options_dropdown_container', 'action_container', 'log', 'status_bar',
+        # State
+        'framework', 'current_selected_option', 'selected_element_options', '_option_by_text', 'url', 'task_description',
+        'selected_action', 'action_value', 'status_text', 'current_log_messages', '_pending_log', '_log_flush_handle',
+        'selected_element', 'secondary_selected_element', 'element_tracking_active', 'task_started', 'browser_launched',
+        '_actions_file',
+        # Selection handling
+        '_pending_selection', '_selection_pending', '_secondary_selections', '_selection_workers', '_selection_lock',
+    )
+
     def __init__(self):
         # UI elements
         self.record_button = None
@@ -340,13 +547,21 @@ class AnnotationUI:
         self.url_input = None
         self.main_container = None
         self.options_select = None
+        self.options_dropdown_container = None
+        self.action_container = None  # Holds the action recording controls, built by _ensure_record_controls
         self.current_selected_option = None
 
 
         self.framework = AnnotationFramework()
+        self.framework.on_element_selected = self._queue_element_selection
+        self.framework.on_secondary_element_selected = self._queue_secondary_element_selection
         self.log = None  # Placeholder for ui.log
-        self.status_label = None  # Placeholder for status ui.label
+        # Entries waiting to be pushed to ui.log by _flush_log; older ones would be dropped by the widget anyway
+        self._pending_log = deque(maxlen=LOG_MAX_LINES)
+        self._log_flush_handle: Optional[asyncio.TimerHandle] = None  # Scheduled _flush_log, None when idle
+        self.status_bar = None  # Placeholder for status ui.html
         self.selected_element_options = None
+        self._option_by_text: Dict[str, Dict] = {}  # Dropdown label -> option, rebuilt by create_options_dropdown
 
         # --- State Variables ---
         self.url: str = DEFAULT_URL
@@ -354,37 +569,65 @@ class AnnotationUI:
         self.selected_action: str = ACTION_TYPES[0]
         self.action_value: str = ""
         self.status_text: str = "Ready. Enter URL and Launch Browser."
-        self.current_log_messages: List[str] = ["Annotation Console initialized."]
+        self.current_log_messages = deque(["Annotation Console initialized."], maxlen=LOG_MAX_LINES)
 
         self.selected_element: Optional[Dict] = None
         self.secondary_selected_element: List[Dict] = []
         self.element_tracking_active: bool = False
         self.task_started: bool = False
         self.browser_launched: bool = False
-        self.task_actions: List[Dict] = []
+        # actions.jsonl of the running task; each recorded action is appended as one line
+        self._actions_file = None
+
+        # Latest primary selection pushed by the browser, handled by _element_selection_worker
+        self._pending_selection: Optional[Dict] = None
+        # The asyncio primitives below bind to a loop on Python < 3.10, so _start_selection_workers creates them
+        # inside the running app loop; nothing queues a selection before that, the browser is launched later
+        self._selection_pending: Optional[asyncio.Event] = None
+        # Secondary selections are all kept, in order, and handled by _secondary_selection_worker
+        self._secondary_selections: Optional[asyncio.Queue] = None
+        self._selection_workers: List[asyncio.Task] = []
+        # Selection handlers await Playwright calls; never let two of them interleave
+        self._selection_lock: Optional[asyncio.Lock] = None
 
         # --- Build UI ---
         self.setup_ui()
-        self.setup_api_endpoints()
+        app.on_startup(self._start_selection_workers)
+        _register_shutdown(self.cleanup)
 
     def add_to_log(self, message: str):
         """Add message to the NiceGUI log"""
         timestamp = datetime.now().strftime("%H:%M:%S")
         log_entry = f"[{timestamp}] {message}"
         self.current_log_messages.append(log_entry)
-        if self.log:
-            self.log.push(log_entry)  # Push to NiceGUI log component
+        self._pending_log.append(log_entry)  # Pushed to the NiceGUI log component by _flush_log
+        # The first entry of a burst schedules one flush; entries arriving until then ride along with it
+        if self._log_flush_handle is None:
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return  # Before the app runs; setup_ui pushes the history and the next entry schedules a flush
+            self._log_flush_handle = loop.call_later(LOG_FLUSH_DELAY, self._flush_log)
+
+    def _flush_log(self):
+        """Push all pending log entries to the NiceGUI log in a single update"""
+        self._log_flush_handle = None
+        if self.log and self._pending_log:
+            self.log.push("\n".join(self._pending_log))
+            self._pending_log.clear()
 
     def update_status(self, message: str):
         """Update the status label"""
         self.status_text = message
-        if self.status_label:
-            self.status_label.set_text(message)
+        if self.status_bar:
+            self.status_bar.set_content(STATUS_BAR_HTML.format(status=escape(message)))
 
     # --- Async Handlers ---
     async def launch_browser(self):
         """Launch Playwright browser and navigate"""
-        if self.browser_launched:
+        # A live context is reused for the new URL; only a dead one is torn down and recreated
+        reuse_context = self.browser_launched and self.framework.is_running()
+        if self.browser_launched and not reuse_context:
             # kill the previous browser
             await self.framework.stop()
             self.browser_launched = False
@@ -400,13 +643,13 @@ class AnnotationUI:
 
 
         try:
-            await self.framework.start(website=self.url)
+            if reuse_context:
+                await self.framework.navigate(self.url)
+            else:
+                await self.framework.start(website=self.url)
             if not self.framework.page:
                 raise Exception("Framework started but page object is missing.")
 
-            # Setup element tracking *after* page is loaded
-            await self.framework.setup_element_tracking()
-
             self.add_to_log(f"Browser launched successfully for {self.url}")
             self.browser_launched = True
             # Enable task start, disable URL section
@@ -439,16 +682,16 @@ class AnnotationUI:
         await self.framework.set_task_name()
         await self.framework.start_recording()
         await self.framework.refresh_page()
-        await self.framework.setup_element_tracking()
 
         self.task_button.props('icon=stop')
         ui.update(self.task_button)
 
         self.task_started = True
-        self.task_actions = []
+        self._actions_file = open(os.path.join(self.framework.main_path, "actions.jsonl"), "ab")
         self.add_to_log(f"Task started: {self.task_description}")
 
         # Enable action recording section, disable task start section
+        self._ensure_record_controls()
         self.value_input.disable()
         self.task_button.disable()
 
@@ -459,18 +702,16 @@ class AnnotationUI:
 
 
 
-    async def handle_secondary_element_selection(self):
-        """Fetch selected element data and update UI"""
+    async def handle_secondary_element_selection_push(self, element_data: Optional[Dict]):
+        """Update UI with the secondary element data pushed from the browser"""
         if not self.element_tracking_active or not self.framework.page:
             print("Element tracking inactive or no page available")
             return  # Don't process if tracking isn't active
 
         try:
-            elements_data = await self.framework.get_secondary_selected_elements_data_from_browser()
-            element_data =elements_data[-1]
             # Use a proper NiceGUI context by using the main container
             with self.main_container:  # Assuming you have a main_container defined in your UI
-                self.add_to_log("Element selection detected in browser. Fetching data...")
+                self.add_to_log("Secondary element selection received from browser.")
 
                 if element_data:
                     self.secondary_selected_element.append(element_data)
@@ -488,21 +729,53 @@ class AnnotationUI:
                     self.update_status("Error fetching secondary element data. Try selecting again.")
 
         except Exception as e:
-            print(f"Error in handle_secondary_element_selection: {e}")
-
-    async def handle_element_selection(self):
-        """Fetch selected element data and update UI"""
+            print(f"Error in handle_secondary_element_selection_push: {e}")
+
+    def _start_selection_workers(self):
+        """Start the long-lived tasks that handle selections once the event loop runs"""
+        self._selection_pending = asyncio.Event()
+        self._secondary_selections = asyncio.Queue()
+        self._selection_lock = asyncio.Lock()
+        self._selection_workers = [asyncio.create_task(self._element_selection_worker()),
+                                   asyncio.create_task(self._secondary_selection_worker())]
+
+    def _queue_element_selection(self, element_data: Dict):
+        """Hand a pushed primary selection to the worker; only the latest one is kept"""
+        self._pending_selection = element_data
+        self._selection_pending.set()
+
+    async def _element_selection_worker(self):
+        """Handle pending primary selections one at a time, collapsing bursts into a single run"""
+        while True:
+            await self._selection_pending.wait()
+            self._selection_pending.clear()
+            await self._handle_selection(self.handle_element_selection_push, self._pending_selection)
+
+    def _queue_secondary_element_selection(self, element_data: Dict):
+        """Hand a pushed secondary selection to the worker"""
+        self._secondary_selections.put_nowait(element_data)
+
+    async def _secondary_selection_worker(self):
+        """Handle queued secondary selections one at a time"""
+        while True:
+            element_data = await self._secondary_selections.get()
+            await self._handle_selection(self.handle_secondary_element_selection_push, element_data)
+
+    async def _handle_selection(self, handler, element_data: Dict):
+        """Run a selection handler once no other selection handler is running"""
+        async with self._selection_lock:
+            await handler(element_data)
+
+    async def handle_element_selection_push(self, element_data: Optional[Dict]):
+        """Update UI with the element data pushed from the browser"""
         if not self.element_tracking_active or not self.framework.page:
             print("Element tracking inactive or no page available")
             return  # Don't process if tracking isn't active
 
         try:
-            # Don't rely on UI-specific context here
-            element_data = await self.framework.get_selected_element_data_from_browser()
-
             # Use a proper NiceGUI context by using the main container
             with self.main_container:  # Assuming you have a main_container defined in your UI
-                self.add_to_log("Element selection detected in browser. Fetching data...")
+                self.add_to_log("Element selection received from browser.")
 
                 if element_data:
                     self.selected_element = element_data
@@ -549,36 +822,12 @@ class AnnotationUI:
                     self.action_select.enabled = False
                     self.value_input.enabled = False
         except Exception as e:
-            print(f"Error in handle_element_selection: {e}")
+            print(f"Error in handle_element_selection_push: {e}")
 
     async def get_dropdown_options(self, element_data):
         """Fetch options from a dropdown element using Python and browser automation"""
         try:
-            # Extract the xpath from element_data
-            xpath = element_data.get('xpath')
-            if not xpath:
-                self.add_to_log("Cannot retrieve dropdown options: No XPath available")
-                return []
-
-            # Get all option elements within the SELECT
-            options_locator = self.framework.page.locator(f"xpath={xpath}//option")
-            options_count = await options_locator.count()
-
-            options = []
-            # Extract data from each option
-            for i in range(options_count):
-                option = options_locator.nth(i)
-
-                # Get properties of each option
-                value = await option.get_attribute("value") or ""
-                text = await option.text_content() or ""
-
-                options.append({
-                    'value': value,
-                    'text': text.strip()
-                })
-
-            return options
+            return await self.framework.get_select_options(element_data)
         except Exception as e:
             print(f"Error getting dropdown options: {e}")
             self.add_to_log(f"Could not retrieve dropdown options: {str(e)}")
@@ -595,6 +844,10 @@ class AnnotationUI:
             with self.options_dropdown_container:
                 # Create the dropdown select
                 option_items = [f"{opt['text']}" for opt in self.selected_element_options]
+                # First option wins on duplicate labels, as with a front-to-back search
+                self._option_by_text = {}
+                for label, opt in zip(option_items, self.selected_element_options):
+                    self._option_by_text.setdefault(label, opt)
                 print(option_items)
                 # Create the dropdown with options
                 self.options_select = ui.select(
@@ -616,13 +869,11 @@ class AnnotationUI:
         """Handle when user selects an option from the dropdown"""
         try:
             # Find the selected option in our list
-            selected_text = e.value
-            for i, opt in enumerate(self.selected_element_options):
-                if f"{opt['text']}" == selected_text:
-                    # Preview the selection
-                    self.add_to_log(f"Selected option: {opt['text']}")
-                    self.current_selected_option = opt
-                    break
+            opt = self._option_by_text.get(e.value)
+            if opt is not None:
+                # Preview the selection
+                self.add_to_log(f"Selected option: {opt['text']}")
+                self.current_selected_option = opt
         except Exception as e:
             print(f"Error handling option selection: {e}")
             self.add_to_log(f"Error selecting option: {str(e)}")
@@ -669,40 +920,40 @@ class AnnotationUI:
             ui.notify("Please select an element in the browser first.", type='warning')
             return
         action_time = datetime.now()
-        await self.framework.unlock_element_in_browser()
-        await self.framework.set_annotation_mode(False)
-        await asyncio.sleep(0.1)
+        # Highlights must be gone from the page before the screenshot is taken
+        await self.framework.unlock_and_disable_annotation()
         await self.framework.start_playwright_tracing_chunk()
+        # Both captures only read the page, which stays untouched until the action runs below; overlap them
+        screenshot_task = asyncio.create_task(self.framework.get_screenshot())
+        # The task ends right after a final click, its page snapshot is never used
+        raw_html_ref = await self.framework.save_raw_html() if action_type != "final_click" else None
         # --- Create and Store Action ---
         action_record = {
             "type": action_type,
             "value": action_value,
             "element": self.selected_element,  # Store details of the element acted upon
             "secondary_elements": self.secondary_selected_element,
-            "timestamp": action_time.isoformat(),
-            "screenshot": await self.framework.get_screenshot(),
-            "raw_html": await self.framework.get_raw_html()
+            "timestamp": action_time,
+            "screenshot": await screenshot_task,
+            "raw_html_ref": raw_html_ref
         }
-        self.task_actions.append(action_record)
+        # Persist right away instead of holding every record (and its HTML) in memory until the task ends
+        self._actions_file.write(_dumps_json(action_record, indent=False) + b"\n")
+        self._actions_file.flush()
         log_msg = f"Recorded: {action_type}"
         if action_value: log_msg += f" - Value: '{action_value}'"
         log_msg += f" on <{self.selected_element.get('tagName', '?')}>"
         self.add_to_log(log_msg)
 
         # --- Execute Action in Browser (Optional but Recommended) ---
-        action_executed = False
-        if action_type == "final_click":
-            action_executed = True
-        elif action_type == "click":
-            action_executed = await self.framework.click_element(self.selected_element)
-        elif action_type == "type":
-            action_executed = await self.framework.type_text(self.selected_element, action_value)
-        elif action_type == "select":
-            action_executed = await self.framework.select_option(self.selected_element, action_value)
+        handler = AnnotationFramework.ACTION_HANDLERS.get(action_type)
+        if handler:
+            action_executed = await handler(self.framework, self.selected_element, action_value)
         else:
-            # Should not happen if action types are validated
-            self.add_to_log(f"Warning: Unknown action type '{action_type}' encountered during execution.")
-            action_executed = True  # Treat as success to proceed
+            if action_type != "final_click":
+                # Should not happen if action types are validated
+                self.add_to_log(f"Warning: Unknown action type '{action_type}' encountered during execution.")
+            action_executed = True  # Nothing to execute, treat as success to proceed
 
         await self.framework.stop_playwright_tracing_chunk()
         # --- Post-Action Cleanup ---
@@ -722,7 +973,6 @@ class AnnotationUI:
         self.record_button.disable()
         self.action_select.disable()
         self.value_input.disable()
-        await self.framework.setup_element_tracking()
         if action_type == "final_click":
             await self.finish_task()
 
@@ -741,13 +991,16 @@ class AnnotationUI:
 
         # Disable annotation mode in browser and ensure element is unlocked
         if self.framework.page:
-            await self.framework.set_annotation_mode(False)
             # Unlock just in case it was somehow locked without Python knowing
-            await self.framework.unlock_element_in_browser()
+            await self.framework.unlock_and_disable_annotation()
+
+        # Screenshots and page snapshots are written in the background; they must be on disk before zipping
+        await self.framework.flush_writes()
 
         # Save the task data
+        payload = None
         try:
-            filename = await self.save_task_data()
+            filename, payload = await self.save_task_data()
             self.add_to_log(f"Task data saved successfully to {filename}")
             self.framework.logger.info(f"Task data saved successfully to {filename}")
             ui.notify(f"Task data saved to {filename}", type='positive')
@@ -757,12 +1010,11 @@ class AnnotationUI:
             self.add_to_log(f"Error saving task data: {e}")
             self.framework.logger.error(f"Failed to save task data: {e}")
             ui.notify(f"Failed to save task data: {e}", type='negative')
-        self.update_zip_folder()
+        await self.update_zip_folder(payload)
 
         # Reset UI state for a new task (keep browser open)
         self.selected_element = None
         self.secondary_selected_element = []
-        self.task_actions = []
         self.action_select.disable()
         self.value_input.set_value("")  # Clear value
         self.value_input.disable()
@@ -776,55 +1028,78 @@ class AnnotationUI:
         self.update_status("Task finished and saved. Ready for new task or close browser.")
 
 
-    def update_zip_folder(self):
+    async def update_zip_folder(self, actions_payload: Optional[bytes]):
+        """Pack actions.json and the captures into the trace zip without blocking the event loop"""
+        await asyncio.to_thread(self._update_zip_folder_sync, actions_payload)
+
+    def _update_zip_folder_sync(self, actions_payload: Optional[bytes]):
+        import zipfile  # Only needed once per finished task, kept out of startup
+
         # Define the paths
-        json_file_path = os.path.join(self.framework.main_path, "actions.json")
-        trace_zip_path = os.path.join(self.framework.main_path, "playwright_traces", "main_trace.zip")
-        screenshot_folder = os.path.join(self.framework.main_path, "screenshots")
+        base = self.framework.main_path
+        trace_zip_path = os.path.join(base, "playwright_traces", "main_trace.zip")
+        capture_folders = ("screenshots", "html")
 
-        final_zip_path = f"{self.framework.main_path}.zip"
+        final_zip_path = f"{base}.zip"
 
-        # Add the actions.json file to the ZIP
-        with zipfile.ZipFile(trace_zip_path, 'a') as zip_ref:
-            # The second parameter is the arcname (path within the ZIP)
-            # Here we're adding it to the root of the ZIP
-            zip_ref.write(json_file_path, os.path.basename(json_file_path))
-            # Add screenshots to the ZIP
-            for root, _, files in os.walk(screenshot_folder):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    # Calculate the arcname (path within the ZIP)
-                    arcname = os.path.relpath(file_path, screenshot_folder)
-                    zip_ref.write(file_path, os.path.join("screenshots",
-                                                          arcname))  # Adds screenshots to a 'screenshots' folder inside the zip
+        # Add the actions.json file to the ZIP; captures are stored as they are since JPEG and gzip are already compressed
+        with zipfile.ZipFile(trace_zip_path, 'a', compression=zipfile.ZIP_STORED) as zip_ref:
+            # Added to the root of the ZIP from the bytes save_task_data just wrote, skipping a read of the file
+            if actions_payload is not None:
+                zip_ref.writestr("actions.json", actions_payload, compress_type=zipfile.ZIP_DEFLATED)
+            # Add screenshots and page snapshots to the ZIP
+            for folder_name in capture_folders:
+                # Both folders are flat, a single scandir pass lists them without extra stat calls
+                with os.scandir(os.path.join(base, folder_name)) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            zip_ref.write(entry.path, f"{folder_name}/{entry.name}")  # Keeps the folder name inside the zip
 
 
-        shutil.move(trace_zip_path, final_zip_path)
+        os.replace(trace_zip_path, final_zip_path)  # Same filesystem, a single atomic rename
 
         print(f"Successfully updated ZIP and moved to {final_zip_path}")
 
     async def save_task_data(self):
-        """Save task data to JSON file"""
+        """Save task data to JSON file, returning its path and contents"""
         task_data = {
             "task_description": self.task_description,
             "website": self.url,
-            "timestamp": datetime.now().isoformat(),
-            "actions": self.task_actions
+            "timestamp": datetime.now(),
         }
 
-        filename = os.path.join(self.framework.main_path, f"actions.json")
+        base = self.framework.main_path
+        filename = os.path.join(base, "actions.json")
+        self._close_actions_file()
+
+        # The recorded actions are already encoded in actions.jsonl; splice them into the document as they are
+        header = _dumps_json(task_data)
+        payload = await asyncio.to_thread(_write_actions_json, filename, header, os.path.join(base, "actions.jsonl"))
 
-        with open(filename, "w") as f:
-            json.dump(task_data, f, indent=4)  # Use indent for readability
+        return filename, payload
 
-        return filename
+    def _close_actions_file(self):
+        if self._actions_file is not None:
+            self._actions_file.close()
+            self._actions_file = None
 
     async def cleanup(self):
         """Called when the NiceGUI app is shutting down"""
         self.add_to_log("Application shutting down...")
+        self._close_actions_file()
         await self.framework.stop()
+        await AnnotationFramework.close_browser()
         self.add_to_log("Cleanup finished.")
 
+    def _on_url_change(self, e):
+        self.url = e.value
+
+    def _on_task_description_change(self, e):
+        self.task_description = e.value
+
+    def _on_value_change(self, e):
+        self.action_value = e.value
+
     def on_action_select(self, e):
         # Update the selected action
         self.selected_action = e.value
@@ -833,32 +1108,56 @@ class AnnotationUI:
         else:
             self.options_dropdown_container.clear()
 
+    def _ensure_record_controls(self):
+        """Build the action recording controls the first time they are needed"""
+        if self.record_button is not None:
+            return
+        with self.action_container:
+            self.action_select = ui.select(ACTION_TYPES, label='Action', value=self.selected_action,
+                                           on_change=self.on_action_select) \
+                .props(FIELD_PROPS).classes('w-full')
+
+            # Debounced on the client so typing doesn't send an update per keystroke
+            self.value_input = ui.input('Value (if applicable)', value=self.action_value,
+                                        on_change=self._on_value_change) \
+                .props(f'{FIELD_PROPS} debounce=150').classes('w-full')
+
+            # Create options dropdown container (initially hidden)
+            with ui.element('div').classes('w-full mt-1') as self.options_dropdown_container:
+                pass
+
+            self.record_button = ui.button('Record Action', on_click=self.record_action) \
+                .props('icon=radio_button_checked').classes('bg-accent text-white w-full')
+            self.record_button.disable()  # Initially disabled
+            self.action_select.disable()
+            self.value_input.disable()
+
     # --- UI Setup Method ---
     def setup_ui(self):
-        self.main_container = ui.column().classes('h-screen w-full fixed left-0 top-0 bg-gray-100 overflow-auto p-1')
+        self.main_container = ui.column().classes(MAIN_CONTAINER_CLASSES)
         # Change max-w-2/3 to w-2/3 to set the exact width
         with self.main_container:
             # URL Section
-            with ui.column().classes('w-full mb-1'):
+            with ui.column().classes(SECTION_CLASSES):
                 # Create a row to hold the URL input and launch button side by side
                 with ui.row().classes('w-full items-center'):
                     self.url_input = ui.input('Website URL', placeholder='e.g., https://www.example.com',
-                                              value=self.url, on_change=lambda e: setattr(self, 'url', e.value)) \
-                        .props('dense outlined').classes('flex-grow')
+                                              value=self.url, on_change=self._on_url_change) \
+                        .props(FIELD_PROPS).classes('flex-grow')
 
                     # Position the launch button next to the input field
                     self.launch_button = ui.button('', on_click=self.launch_browser) \
                         .props('icon=launch').classes('bg-primary text-white ml-1')
 
             # Task Description Section
-            with ui.column().classes('w-full mb-1'):
+            with ui.column().classes(SECTION_CLASSES):
                 # Create a row to hold the task input and start button side by side
                 with ui.row().classes('w-full items-center align-top'):
                     # Replace input with textarea for multi-line support
                     self.task_goal = ui.textarea('Task Description', placeholder='e.g., Search for product X',
                                                   value=self.task_description,
-                                                  on_change=lambda e: setattr(self, 'task_description', e.value)) \
-                        .props('dense outlined rows=2').classes('flex-grow').bind_enabled_from(self,
+                                                  on_change=self._on_task_description_change) \
+                        .props(f'{FIELD_PROPS} rows=2').classes('flex-grow').bind_enabled_from(self,
                                                                                                'browser_launched')
 
                     # Position the task button next to the input field (align to top)
@@ -866,64 +1165,20 @@ class AnnotationUI:
                         .props('icon=play_arrow').classes('bg-positive text-white ml-1 self-start mt-4') \
                         .bind_enabled_from(self, 'browser_launched')
 
-            # Action Recording Section
-            with ui.column().classes('w-full mb-1'):
-                self.action_select = ui.select(ACTION_TYPES, label='Action', value=self.selected_action,
-                                               on_change=self.on_action_select) \
-                    .props('dense outlined').classes('w-full')
-
-                self.value_input = ui.input('Value (if applicable)', value=self.action_value,
-                                            on_change=lambda e: setattr(self, 'action_value', e.value)) \
-                    .props('dense outlined').classes('w-full')
-
-                # Create options dropdown container (initially hidden)
-                with ui.element('div').classes('w-full mt-1') as self.options_dropdown_container:
-                    pass
-
-                self.record_button = ui.button('Record Action', on_click=self.record_action) \
-                    .props('icon=radio_button_checked').classes('bg-accent text-white w-full')
-                self.record_button.disable()  # Initially disabled
-                self.action_select.disable()
-                self.value_input.disable()
+            # Action Recording Section, filled in when the first task starts
+            self.action_container = ui.column().classes(SECTION_CLASSES)
 
             # Log Output Section
             with ui.column().classes('w-full'):
                 # Use ui.log for auto-scrolling log display
-                self.log = ui.log(max_lines=50).classes('w-full h-64 bg-gray-100 rounded p-2 font-mono text-sm')
-                # Initialize log with existing messages
-                for msg in self.current_log_messages:
-                    self.log.push(msg)
+                self.log = ui.log(max_lines=LOG_MAX_LINES).classes(LOG_CLASSES)
+                # Initialize log with existing messages in a single update
+                self.log.push("\n".join(self.current_log_messages))
+                self._pending_log.clear()  # Already part of the history pushed above
 
             # Status Bar (at the bottom of the column)
-            with ui.row().classes('w-full mt-auto bg-gray-200 p-1 rounded-lg items-center'):
-                ui.icon('info').classes('text-primary mr-1')
-                self.status_label = ui.label(self.status_text).classes('text-sm')
-
-        # --- Register App Shutdown Handler ---
-        # Use app context if available (newer NiceGUI versions)
-        if hasattr(context, 'app'):
-            context.app.on_shutdown(self.cleanup)
-        else:  # Fallback for older versions
-            app.on_shutdown(self.cleanup)
-
-    def setup_api_endpoints(self):
-        """Set up API endpoints for browser-to-Python communication"""
-
-        @app.get('/api/notify-primary-selected')
-        async def notify_primary_element_selected():
-            """API endpoint that JavaScript can call when an element is selected"""
-            # Directly call the handler without checking context.client.connected
-            # This avoids the UI context dependency
-            asyncio.create_task(self.handle_element_selection())
-            return {'status': 'success'}
-
-        @app.get('/api/notify-secondary-selected')
-        async def notify_secondary_element_selected():
-            """API endpoint that JavaScript can call when an element is selected"""
-            # Directly call the handler without checking context.client.connected
-            # This avoids the UI context dependency
-            asyncio.create_task(self.handle_secondary_element_selection())
-            return {'status': 'success'}
+            self.status_bar = ui.html(STATUS_BAR_HTML.format(status=escape(self.status_text))) \
+                .classes(STATUS_BAR_CLASSES)
 
 
 # --- Main Execution ---